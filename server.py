@@ -1,18 +1,41 @@
 """微信公众号文章解析 MCP Server - 基于 FastMCP 框架"""
 
 import os
-import json
 import re
+import atexit
+import functools
+import asyncio
+import hashlib
 import logging
+import threading
 import time
-from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple, Union
 from pathlib import Path
 from datetime import datetime
 
+import httpx
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from fastmcp import FastMCP
 
+# bs4、selectolax、lxml 只在解析文章时用到，延迟到首次使用时导入，加快服务启动
+if TYPE_CHECKING:
+    from bs4 import Tag
+    from selectolax.lexbor import LexborHTMLParser
+
+@functools.lru_cache(maxsize=1)
+def get_html_parser() -> str:
+    """HTML 解析器：优先使用 C 实现的 lxml，未安装时回退到标准库 html.parser"""
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
 # 创建 MCP 服务实例
 mcp = FastMCP("wechat-article-parser-mcp-server")
 
@@ -24,41 +47,196 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def error_response(code: str, message: str) -> str:
-    """创建错误响应 JSON 字符串"""
-    response = {
+# HTTP 重试策略（同步会话与异步客户端一致）：连接失败、超时或网关错误时重试，总尝试次数为 HTTP_RETRIES + 1
+HTTP_RETRIES = 2
+HTTP_RETRY_STATUSES = frozenset([502, 503, 504])
+HTTP_RETRY_BACKOFF = 1  # 指数退避系数（秒）
+
+def retry_backoff(retry: int) -> float:
+    """第 retry 次重试前的等待时间（秒），与 urllib3 Retry 的指数退避一致：第一次重试立即进行"""
+    if retry <= 1:
+        return 0
+    return HTTP_RETRY_BACKOFF * 2 ** (retry - 1)
+
+def create_session(retries: int = HTTP_RETRIES) -> requests.Session:
+    """创建复用连接池的 HTTP 会话，避免每次请求重新进行 TCP/TLS 握手
+
+    retries 为连接失败、超时或网关错误时的重试次数（指数退避），总尝试次数为 retries + 1
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=HTTP_RETRY_BACKOFF,
+            status_forcelist=HTTP_RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'POST']),
+        ),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# 抓取微信公众号文章的会话：最多尝试 3 次，设置请求头，模拟浏览器访问
+SESSION = create_session()
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+})
+
+# 调用智谱 AI API 的会话：不携带浏览器请求头，最多尝试 3 次
+LLM_SESSION = create_session()
+
+# 异步 HTTP 客户端：供批量任务并发调用 LLM，HTTP/2 多路复用同一连接；
+# 传输层不重试，重试由 post_with_retries_async 按与同步会话相同的策略处理
+ASYNC_CLIENT = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    ),
+    timeout=120,
+)
+
+async def post_with_retries_async(url: str, **kwargs: Any) -> httpx.Response:
+    """通过 ASYNC_CLIENT 发送 POST 请求，连接失败、超时或网关错误时按 HTTP_RETRIES 重试"""
+    for retry in range(HTTP_RETRIES + 1):
+        if retry:
+            await asyncio.sleep(retry_backoff(retry))
+        try:
+            response = await ASYNC_CLIENT.post(url, **kwargs)
+        except httpx.TransportError as e:
+            if retry == HTTP_RETRIES:
+                raise
+            logger.warning(f"Async request failed, retrying ({retry + 1}/{HTTP_RETRIES}): {str(e)}")
+            continue
+        if response.status_code in HTTP_RETRY_STATUSES and retry < HTTP_RETRIES:
+            logger.warning(f"Async request got HTTP {response.status_code}, retrying ({retry + 1}/{HTTP_RETRIES})")
+            continue
+        return response
+
+class TTLCache:
+    """带有效期和容量上限的线程安全 LRU 缓存：过期条目在读取时淘汰，超出容量时淘汰最久未使用的条目"""
+    
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl  # 缓存有效期（秒）
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """读取缓存，过期或不存在时返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """写入缓存"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+def cache_key(*parts: str) -> str:
+    """由若干字符串生成缓存键（SHA-1 摘要）"""
+    return hashlib.sha1("\x00".join(parts).encode('utf-8')).hexdigest()
+
+# LLM 结果缓存：相同文章的摘要 / 分析直接复用，避免重复调用 LLM
+RESPONSE_CACHE = TTLCache(ttl=3600, maxsize=256)
+
+def dumps_json(obj: Any) -> str:
+    """序列化为 JSON 字符串（orjson 原生输出 UTF-8，中文不转义）"""
+    return orjson.dumps(obj).decode('utf-8')
+
+def error_payload(code: str, message: str) -> Dict[str, Any]:
+    """创建错误响应字典"""
+    return {
         "success": False,
         "error": {
             "code": code,
             "message": message
         }
     }
-    return json.dumps(response, ensure_ascii=False)
+
+def error_response(code: str, message: str) -> str:
+    """创建错误响应 JSON 字符串"""
+    return dumps_json(error_payload(code, message))
+
+# 微信公众号文章 URL 匹配
+WECHAT_URL_RE = re.compile(r'https?://(?:mp\.)?weixin\.qq\.com')
+WECHAT_URL_PREFIXES = (
+    'https://mp.weixin.qq.com',
+    'http://mp.weixin.qq.com',
+    'https://weixin.qq.com',
+    'http://weixin.qq.com',
+)
 
 def validate_wechat_url(url: str) -> Tuple[bool, Optional[str]]:
     """验证微信公众号文章 URL，返回 (是否有效, 错误消息)"""
     if not url or not url.strip():
         return False, "URL cannot be empty. Please provide a valid WeChat article URL."
     
-    # 检查是否是微信公众号文章 URL
-    wechat_patterns = [
-        r'https?://mp\.weixin\.qq\.com',
-        r'https?://weixin\.qq\.com',
-    ]
-    
-    is_wechat = any(re.search(pattern, url) for pattern in wechat_patterns)
+    # 检查是否是微信公众号文章 URL（常见前缀直接命中，否则再走正则）
+    is_wechat = url.startswith(WECHAT_URL_PREFIXES) or WECHAT_URL_RE.search(url) is not None
     if not is_wechat:
         return False, "Invalid WeChat article URL. Please provide a URL from mp.weixin.qq.com"
     
     return True, None
 
-def clean_html_content(html_content: str) -> str:
-    """清理 HTML 内容，提取纯文本"""
+# 文章字段的 CSS 选择器，按优先级排列
+TITLE_SELECTORS = ('h1.rich_media_title', 'h1#activity-name')
+AUTHOR_SELECTORS = (
+    'a.rich_media_meta.rich_media_meta_link.rich_media_meta_nickname',
+    'strong.profile_nickname',
+    'a#js_name',
+)
+PUBLISH_TIME_SELECTORS = (
+    'em.rich_media_meta.rich_media_meta_text',
+    'span.rich_media_meta.rich_media_meta_text',
+    'em#publish_time',
+)
+DESCRIPTION_SELECTORS = ('meta[property="og:description"]', 'meta[name="description"]')
+
+def select_text(tree: "LexborHTMLParser", selectors: Tuple[str, ...]) -> str:
+    """按优先级依次尝试 CSS 选择器，返回第一个命中节点的纯文本"""
+    for selector in selectors:
+        node = tree.css_first(selector)
+        if node is not None:
+            return node.text(strip=True)
+    return ""
+
+# 文本断行位置：任意换行符（与 str.splitlines 一致）或连续两个空格，连同两侧的空白
+LINE_BREAK_RE = re.compile(r'\s*(?:[\n\r\v\f\x1c-\x1e\x85\u2028\u2029]|  )\s*')
+
+def clean_html_content(html_content: Union[str, "Tag"]) -> str:
+    """清理 HTML 内容，提取纯文本；传入已解析的 Tag 时直接在其上处理，不再重新解析"""
     if not html_content:
         return ""
     
+    from bs4 import BeautifulSoup, Tag
+    
     # 使用 BeautifulSoup 解析并提取文本
-    soup = BeautifulSoup(html_content, 'html.parser')
+    if isinstance(html_content, Tag):
+        soup = html_content
+    else:
+        soup = BeautifulSoup(html_content, get_html_parser())
     
     # 移除脚本和样式标签
     for script in soup(["script", "style"]):
@@ -67,75 +245,60 @@ def clean_html_content(html_content: str) -> str:
     # 获取文本并清理
     text = soup.get_text()
     
-    # 清理多余的空白字符
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    text = '\n'.join(chunk for chunk in chunks if chunk)
-    
-    return text
+    # 清理多余的空白字符：换行或连续两个空格处断行，并去掉断行处两侧的空白
+    return LINE_BREAK_RE.sub('\n', text).strip()
 
 
-def parse_wechat_article(url: str, include_content: bool = False) -> Dict[str, Any]:
-    """解析微信公众号文章，返回包含标题、作者、发布时间等信息的字典"""
+# 正文容器的 CSS 选择器，按优先级排列（与 BeautifulSoup 的 class_ 匹配一致，多 class 的 div 同样命中）
+CONTENT_SELECTORS = ('div.rich_media_content', 'div#js_content')
+
+def find_content_elem(tree: "LexborHTMLParser") -> Optional["Tag"]:
+    """在已解析的 selectolax 树中定位正文容器，只将该节点的 HTML 交给 BeautifulSoup 解析，跳过页面其余内容"""
+    from bs4 import BeautifulSoup
+    
+    for selector in CONTENT_SELECTORS:
+        node = tree.css_first(selector)
+        if node is not None:
+            return BeautifulSoup(node.html, get_html_parser()).find('div')
+    return None
+
+def fetch_wechat_article(url: str) -> Dict[str, Any]:
+    """抓取并解析微信公众号文章，返回包含标题、作者、发布时间和完整正文的字典"""
     try:
-        # 设置请求头，模拟浏览器访问
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        
         logger.info(f"Fetching article from: {url}")
         
         # 发送请求
-        response = requests.get(url, headers=headers, timeout=30)
+        response = SESSION.get(url, timeout=30)
         response.raise_for_status()
+        # 微信公众号页面均为 UTF-8：直接解码字节，跳过 requests 的字符集探测，
+        # 只解码一次，字段定位和正文解析共用
+        response.encoding = 'utf-8'
+        html = response.content.decode('utf-8', errors='replace')
+        
+        # 定位标题、作者、发布时间等字段（selectolax 的 CSS 查询远快于 BeautifulSoup 建树）
+        from selectolax.lexbor import LexborHTMLParser
+        tree = LexborHTMLParser(html)
+        title = select_text(tree, TITLE_SELECTORS)
+        author = select_text(tree, AUTHOR_SELECTORS)
+        publish_time = select_text(tree, PUBLISH_TIME_SELECTORS)
         
-        # 解析 HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 提取文章标题
-        title = ""
-        title_elem = soup.find('h1', class_='rich_media_title') or soup.find('h1', id='activity-name')
-        if title_elem:
-            title = title_elem.get_text(strip=True)
-        
-        # 提取作者
-        author = ""
-        author_elem = soup.find('a', class_='rich_media_meta rich_media_meta_link rich_media_meta_nickname') or \
-                     soup.find('strong', class_='profile_nickname') or \
-                     soup.find('a', id='js_name')
-        if author_elem:
-            author = author_elem.get_text(strip=True)
-        
-        # 提取发布时间
-        publish_time = ""
-        time_elem = soup.find('em', class_='rich_media_meta rich_media_meta_text') or \
-                   soup.find('span', class_='rich_media_meta rich_media_meta_text') or \
-                   soup.find('em', id='publish_time')
-        if time_elem:
-            publish_time = time_elem.get_text(strip=True)
+        # 提取文章摘要/描述
+        description = ""
+        for selector in DESCRIPTION_SELECTORS:
+            desc_elem = tree.css_first(selector)
+            if desc_elem is not None:
+                description = desc_elem.attributes.get('content') or ''
+                break
         
-        # 提取文章正文（只关注文字内容）
+        # 提取文章正文（只关注文字内容），正文清理仍使用 BeautifulSoup
         content_text = ""
-        content_elem = soup.find('div', class_='rich_media_content') or \
-                      soup.find('div', id='js_content')
+        content_elem = find_content_elem(tree)
         
         if content_elem:
             # 只获取纯文本内容，不关心 HTML 和图片
-            content_text = clean_html_content(str(content_elem))
+            content_text = clean_html_content(content_elem)
         
-        # 提取文章摘要/描述
-        description = ""
-        desc_elem = soup.find('meta', property='og:description') or \
-                   soup.find('meta', attrs={'name': 'description'})
-        if desc_elem:
-            description = desc_elem.get('content', '')
-        
-        # 构建返回结果
+        # 构建返回结果（包含完整正文，是否只返回预览由 parse_wechat_article 决定）
         result = {
             "success": True,
             "url": url,
@@ -146,18 +309,12 @@ def parse_wechat_article(url: str, include_content: bool = False) -> Dict[str, A
             "metadata": {
                 "charset": response.encoding,
                 "content_type": response.headers.get('Content-Type', ''),
-            }
-        }
-        
-        # 只在需要时包含正文内容
-        if include_content:
-            result["content"] = {
+            },
+            "content": {
                 "text": content_text,
                 "length": len(content_text)
             }
-        else:
-            # 只提供正文预览（前200字）
-            result["content_preview"] = content_text[:200] + "..." if len(content_text) > 200 else content_text
+        }
         
         return result
         
@@ -168,14 +325,34 @@ def parse_wechat_article(url: str, include_content: bool = False) -> Dict[str, A
         logger.error(f"Parsing error: {str(e)}")
         raise Exception(f"Failed to parse article: {str(e)}")
 
-def generate_detailed_summary(content_text: str, title: str = "") -> str:
-    """使用 LLM 生成详细摘要（至少十句话，总结全文和分段要点）"""
-    if not content_text or len(content_text.strip()) < 100:
-        return "文章内容过短，无法生成详细摘要。"
+# 已解析文章缓存：parse_article、analyze_with_llm 等先后处理同一 URL 时只抓取和解析一次
+ARTICLE_CACHE = TTLCache(ttl=600, maxsize=128)
+
+def parse_wechat_article(url: str, include_content: bool = False) -> Dict[str, Any]:
+    """解析微信公众号文章，返回包含标题、作者、发布时间等信息的字典；同一 URL 在缓存有效期内只抓取一次"""
+    article = ARTICLE_CACHE.get(url)
+    if article is None:
+        article = fetch_wechat_article(url)
+        ARTICLE_CACHE.set(url, article)
+    else:
+        logger.info(f"Article cache hit: {url}")
     
-    try:
-        # 构建提示词
-        prompt = f"""请为以下文章生成详细摘要，要求：
+    result = dict(article)
+    # 只在需要时包含正文内容
+    if not include_content:
+        # 只提供正文预览（前200字）
+        content_text = result.pop("content")["text"]
+        result["content_preview"] = content_text[:200] + "..." if len(content_text) > 200 else content_text
+    
+    return result
+
+# LLM 提示词：固定指令放在 system 消息中，文章内容放在 user 消息中。
+# 智谱 AI 会自动缓存相同的请求前缀，指令保持不变即可命中缓存，降低首字延迟和 token 费用。
+EXPERT_SYSTEM_PROMPT = "你是一位擅长分析微信公众号文章的专家，能够进行深入的语义分析、观点提取和结构分析。"
+
+SUMMARY_SYSTEM_PROMPT = f"""{EXPERT_SYSTEM_PROMPT}
+
+请为用户提供的文章生成详细摘要，要求：
 
 **输出结构：**
 1. 使用"**总论点**："作为标题，然后用1-2句话总结文章的核心观点
@@ -208,29 +385,201 @@ def generate_detailed_summary(content_text: str, title: str = "") -> str:
 - 必须使用"**总论点**："和"**分论点**："作为分段标题
 - 每个分论点用独立的自然段落表达，段落之间空一行
 - 使用第三人称客观描述，保持人称一致（如"文章"、"作者"、"父亲"等，绝对不要使用"你"、"他"、"爸爸"等，完全用第三人称客观转述）
-- 完全使用自然段落文字，客观准确地呈现内容
+- 完全使用自然段落文字，客观准确地呈现内容"""
+
+ANALYSIS_SYSTEM_PROMPTS = {
+    "viewpoint": f"""{EXPERT_SYSTEM_PROMPT}
+
+请对用户提供的微信公众号文章进行观点提取和分析。
+
+请完成以下分析：
+
+1. **核心观点识别**：提取文章的核心观点（1-2句话）
+2. **分论点链条**：识别文章的主要分论点（3-5个），并说明它们如何支撑核心观点
+3. **论证方式**：分析文章使用了哪些论证方式（案例、数据、引用、故事等）
+4. **观点价值评估**：评估核心观点和分论点的价值（1-5分，说明理由）
+5. **逻辑结构**：分析文章的逻辑结构是否清晰，是否存在逻辑跳跃
+
+请以 Markdown 格式输出，包含表格和结构化内容。""",
+    "structure": f"""{EXPERT_SYSTEM_PROMPT}
+
+请对用户提供的微信公众号文章进行结构分析。
+
+请完成以下分析：
+
+1. **文章结构**：分析文章的整体结构（开头、主体、结尾）
+2. **段落组织**：分析段落之间的逻辑关系
+3. **过渡衔接**：评估段落之间的过渡是否自然
+4. **层次划分**：识别文章的信息层次（标题、小标题、段落等）
+5. **可读性**：评估文章的可读性，给出改进建议
+
+请以 Markdown 格式输出。""",
+    "comprehensive": f"""{EXPERT_SYSTEM_PROMPT}
+
+请对用户提供的微信公众号文章进行深度综合分析。
+
+请完成以下综合分析：
+
+## 1. 核心观点提取
+- 核心观点（1-2句话）
+- 分论点链条（3-5个主要分论点）
+- 观点之间的逻辑关系
+
+## 2. 结构分析
+- 文章整体结构（开头、主体、结尾）
+- 段落组织与逻辑关系
+- 过渡衔接是否自然
+
+## 3. 论证方式分析
+- 使用的论证方式（案例、数据、引用、故事、对比等）
+- 每种论证方式的效果评估
+
+## 4. 语言风格分析
+- 语言特点（简洁/冗长、生动/平淡、专业/通俗等）
+- 表达技巧（修辞手法、金句等）
+- 可读性评估
 
-文章标题：{title if title else '未提供'}
+## 5. 价值与影响评估
+- 观点价值（创新性、实用性、传播价值）
+- 目标读者群体
+- 可能的传播效果
+
+请以 Markdown 格式输出，使用表格和结构化内容，确保分析深入、具体、可操作。不要包含优化建议部分。
+
+**重要**：直接输出 Markdown 内容，不要使用代码块（```）包裹。表格应该直接使用 Markdown 表格语法。""",
+}
+
+
+# 文件名中需要替换为下划线的字符：保留字母数字（含中文）、下划线、连字符和空格
+UNSAFE_CHAR_RE = re.compile(r'[^\w\- ]')
+
+# 后台文件写入线程池：Markdown 文件保存到 Dropbox 同步目录可能较慢，写入不阻塞工具返回
+IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="markdown-writer")
+# 进程退出前等待未完成的写入
+atexit.register(IO_POOL.shutdown, wait=True)
+
+def write_markdown(output_path: Path, markdown: str) -> None:
+    """原子写入 Markdown 文件（先写临时文件再替换），自动创建所在目录"""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # 临时文件名带线程标识，避免 IO_POOL 中并发写同一路径时互相覆盖
+    tmp_path = output_path.with_name(f"{output_path.name}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_text(markdown, encoding='utf-8')
+        # 同一文件系统内的 os.replace 是原子操作，同步盘不会看到写了一半的文件
+        os.replace(tmp_path, output_path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def save_markdown_async(output_path: Path, markdown: str) -> Future:
+    """在 IO_POOL 中后台保存 Markdown 文件，写入结果记录到日志"""
+    future = IO_POOL.submit(write_markdown, output_path, markdown)
+    
+    def log_result(done: Future) -> None:
+        error = done.exception()
+        if error:
+            logger.error(f"Failed to save file {output_path}: {str(error)}")
+        else:
+            logger.info(f"File saved successfully to: {output_path}")
+    
+    future.add_done_callback(log_result)
+    return future
+
+def is_content_too_short(text: str, min_length: int, window: int = 256) -> bool:
+    """判断去除首尾空白后的文本是否短于 min_length，只检查首尾窗口，避免 strip() 复制整篇正文"""
+    if len(text) < min_length:
+        return True
+    if len(text) <= 2 * window:
+        return len(text.strip()) < min_length
+    
+    # 首尾窗口内的空白长度即为整篇文本的首尾空白长度
+    leading = window - len(text[:window].lstrip())
+    trailing = window - len(text[-window:].rstrip())
+    if leading == window or trailing == window:
+        # 窗口内全是空白（极少见），退回完整计算
+        return len(text.strip()) < min_length
+    return len(text) - leading - trailing < min_length
+
+def build_summary_prompt(content_text: str, title: str = "") -> str:
+    """构建摘要的 user 消息，指令在 SUMMARY_SYSTEM_PROMPT 中保持不变，便于命中服务端前缀缓存"""
+    return f"""文章标题：{title if title else '未提供'}
 
 文章正文：
 {content_text[:4000]}"""  # 限制长度，避免超出token限制
-        
-        # 调用 LLM 生成摘要
-        summary = call_llm_api(
-            prompt=prompt,
-            model="glm-4",
-            max_tokens=1500,
-            temperature=0.3
-        )
-        
-        return summary.strip()
-        
+
+def fallback_summary(content_text: str) -> str:
+    """LLM 调用失败时返回简单摘要"""
+    if len(content_text) > 500:
+        return content_text[:500] + "..."
+    return content_text
+
+# 摘要的 LLM 调用参数（同步和异步版本共用）
+SUMMARY_LLM_OPTIONS: Dict[str, Any] = {
+    "system_prompt": SUMMARY_SYSTEM_PROMPT,
+    "model": "glm-4",
+    "max_tokens": 1500,
+    "temperature": 0.3,
+}
+
+def lookup_summary(content_text: str, title: str = "") -> Tuple[Optional[str], str]:
+    """调用 LLM 前的公共步骤，返回 (摘要, prompt)：内容过短或命中缓存时摘要可直接返回，否则为 None"""
+    if not content_text or is_content_too_short(content_text, 100):
+        return "文章内容过短，无法生成详细摘要。", ""
+    
+    prompt = build_summary_prompt(content_text, title)
+    
+    # 相同文章的摘要直接使用缓存（只缓存 LLM 成功返回的结果）
+    summary = RESPONSE_CACHE.get(cache_key("summary", prompt))
+    if summary is not None:
+        logger.info("Summary cache hit")
+    return summary, prompt
+
+def store_summary(prompt: str, reply: str) -> str:
+    """调用 LLM 后的公共步骤：清理回复并写入缓存"""
+    summary = reply.strip()
+    RESPONSE_CACHE.set(cache_key("summary", prompt), summary)
+    return summary
+
+def generate_detailed_summary(content_text: str, title: str = "") -> str:
+    """使用 LLM 生成详细摘要（至少十句话，总结全文和分段要点）"""
+    summary, prompt = lookup_summary(content_text, title)
+    if summary is not None:
+        return summary
+    
+    try:
+        return store_summary(prompt, call_llm_api(prompt=prompt, **SUMMARY_LLM_OPTIONS))
     except Exception as e:
         logger.error(f"Failed to generate summary: {str(e)}")
         # 如果 LLM 调用失败，返回简单摘要
-        if len(content_text) > 500:
-            return content_text[:500] + "..."
-        return content_text
+        return fallback_summary(content_text)
+
+async def generate_detailed_summary_async(content_text: str, title: str = "") -> str:
+    """generate_detailed_summary 的异步版本，供批量任务并发调用"""
+    summary, prompt = lookup_summary(content_text, title)
+    if summary is not None:
+        return summary
+    
+    try:
+        return store_summary(prompt, await call_llm_api_async(prompt=prompt, **SUMMARY_LLM_OPTIONS))
+    except Exception as e:
+        logger.error(f"Failed to generate summary: {str(e)}")
+        return fallback_summary(content_text)
+
+def build_summary_result(url: str, article_data: Dict[str, Any], detailed_summary: str) -> Dict[str, Any]:
+    """构建摘要返回结果（只包含基本信息+详细摘要）"""
+    metadata = article_data.get("metadata", {})
+    return {
+        "success": True,
+        "url": url,
+        "title": article_data.get("title", ""),
+        "author": article_data.get("author", ""),
+        "publish_time": article_data.get("publish_time", ""),
+        "summary": detailed_summary,
+        "metadata": {
+            "charset": metadata.get("charset", ""),
+            "content_type": metadata.get("content_type", ""),
+        }
+    }
 
 
 @mcp.tool()
@@ -259,12 +608,16 @@ def parse_article(url: str, save_summary: Optional[str] = "true") -> str:
             
             # 获取文章内容（已经 include_content=True，所以一定有 content）
             content_text = article_data.get("content", {}).get("text", "")
+            # 后续摘要生成和 Markdown 模板多次用到的字段先绑定为局部变量
+            title = article_data.get("title", "")
+            author = article_data.get("author", "")
+            publish_time = article_data.get("publish_time", "")
             
             # 生成详细摘要
             logger.info("Generating detailed summary using LLM...")
             detailed_summary = generate_detailed_summary(
                 content_text=content_text,
-                title=article_data.get("title", "")
+                title=title
             )
             
             # 如果要求保存摘要，保存为 Markdown 文件
@@ -272,24 +625,21 @@ def parse_article(url: str, save_summary: Optional[str] = "true") -> str:
             # 处理字符串参数（"true"/"false"）
             should_save = str(save_summary).lower() in ('true', '1', 'yes', 'on')
             if should_save:
-                safe_title = "".join(c if c.isalnum() or c in ('-', '_', ' ') else '_' for c in article_data.get("title", "未命名文章"))
-                safe_title = safe_title[:50]
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                safe_title = UNSAFE_CHAR_RE.sub('_', (title or "未命名文章")[:50])
+                now = datetime.now()
+                timestamp = now.strftime("%Y%m%d_%H%M%S")
                 # 保存到项目根目录（/Users/yingzhang/Library/CloudStorage/Dropbox/Cursor2025）
                 base_dir = Path("/Users/yingzhang/Library/CloudStorage/Dropbox/Cursor2025")
                 output_path = base_dir / f"{safe_title}-摘要-{timestamp}.md"
                 
-                # 确保目录存在
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                
                 # 构建 Markdown 内容
                 summary_markdown = f"""# 文章摘要
 
-**文章标题**: {article_data.get("title", "")}  
-**作者**: {article_data.get("author", "")}  
-**发布时间**: {article_data.get("publish_time", "")}  
+**文章标题**: {title}  
+**作者**: {author}  
+**发布时间**: {publish_time}  
 **文章链接**: {url}  
-**生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+**生成时间**: {now.strftime('%Y-%m-%d %H:%M:%S')}
 
 ---
 
@@ -302,43 +652,20 @@ def parse_article(url: str, save_summary: Optional[str] = "true") -> str:
 **注**: 本摘要由 LLM 生成，基于语义理解和深度分析。
 """
                 
-                # 保存文件
-                try:
-                    with open(output_path, 'w', encoding='utf-8') as f:
-                        f.write(summary_markdown)
-                    # 验证文件确实被保存
-                    if output_path.exists():
-                        file_path = str(output_path.absolute())  # 返回绝对路径
-                        logger.info(f"Summary saved successfully to: {file_path}")
-                    else:
-                        logger.error(f"File write completed but file doesn't exist: {output_path}")
-                        file_path = None
-                except Exception as e:
-                    logger.error(f"Failed to save summary file: {str(e)}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-                    file_path = None
+                # 后台保存文件，不阻塞返回
+                save_markdown_async(output_path, summary_markdown)
+                file_path = str(output_path.absolute())  # 返回绝对路径
+                file_size = len(summary_markdown.encode('utf-8'))
             
             # 构建返回结果（只包含基本信息+详细摘要）
-            result = {
-                "success": True,
-                "url": url,
-                "title": article_data.get("title", ""),
-                "author": article_data.get("author", ""),
-                "publish_time": article_data.get("publish_time", ""),
-                "summary": detailed_summary,
-                "metadata": {
-                    "charset": article_data.get("metadata", {}).get("charset", ""),
-                    "content_type": article_data.get("metadata", {}).get("content_type", ""),
-                }
-            }
+            result = build_summary_result(url, article_data, detailed_summary)
             
             # 如果保存了文件，添加文件路径
             if file_path:
                 result["file_path"] = file_path
-                result["file_size"] = Path(file_path).stat().st_size if Path(file_path).exists() else 0
+                result["file_size"] = file_size
             
-            return json.dumps(result, ensure_ascii=False)
+            return dumps_json(result)
             
         except Exception as e:
             logger.error(f"Parsing error: {str(e)}")
@@ -355,80 +682,154 @@ def parse_article(url: str, save_summary: Optional[str] = "true") -> str:
         return error_response("INTERNAL_ERROR", "An unexpected error occurred. Please try again.")
 
 
-def call_llm_api(prompt: str, model: str = "glm-4", max_tokens: int = 4000, temperature: float = 0.3) -> str:
-    """调用智谱 AI API 进行分析"""
+async def summarize_article_async(url: str) -> Dict[str, Any]:
+    """解析单篇文章并生成详细摘要，失败时返回包含错误信息的字典"""
+    is_valid, error_msg = validate_wechat_url(url)
+    if not is_valid:
+        return {"url": url, **error_payload("INVALID_URL", error_msg)}
+    
     try:
-        api_key = os.getenv("ZHIPU_API_KEY")
-        if not api_key:
-            try:
-                from config import ZHIPU_API_KEY
-                api_key = ZHIPU_API_KEY
-            except ImportError:
-                pass
-        if not api_key:
-            raise Exception("ZHIPU_API_KEY not found. Please set ZHIPU_API_KEY environment variable in MCP configuration.")
+        # 抓取和解析使用同步 SESSION，放到线程中执行，不阻塞事件循环
+        article_data = await asyncio.to_thread(parse_wechat_article, url, True)
+        if not article_data.get("success"):
+            return {"url": url, **error_payload("PARSE_ERROR", "Failed to parse article.")}
+        
+        detailed_summary = await generate_detailed_summary_async(
+            content_text=article_data.get("content", {}).get("text", ""),
+            title=article_data.get("title", "")
+        )
+        return build_summary_result(url, article_data, detailed_summary)
+    
+    except Exception as e:
+        logger.error(f"Parsing error: {str(e)}")
+        return {"url": url, **error_payload("PARSE_ERROR", f"Failed to parse article: {str(e)}")}
+
+
+# 批量任务同时处理的文章数上限：小于 ASYNC_CLIENT 的 max_connections，
+# LLM 调用不必排队等待连接池，也就不会因连接池超时而回退为简单摘要
+BATCH_CONCURRENCY = 8
+
+@mcp.tool()
+async def parse_articles_batch(urls: List[str]) -> str:
+    """批量解析多篇微信公众号文章，并发抓取并生成详细摘要（不保存 Markdown 文件）
+    
+    Args:
+        urls: 微信公众号文章 URL 列表
+    """
+    try:
+        logger.info(f"Batch parsing request: {len(urls)} urls")
         
-        # 智谱 AI API endpoint
-        api_url = "https://open.bigmodel.cn/api/paas/v4/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
+        if not urls:
+            return error_response("INVALID_URL", "URL list cannot be empty. Please provide at least one WeChat article URL.")
         
-        payload = {
-            "model": model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "你是一位擅长分析微信公众号文章的专家，能够进行深入的语义分析、观点提取和结构分析。"
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "max_tokens": max_tokens,
-            "temperature": temperature
-        }
+        # 各篇文章的网络请求和 LLM 调用并发执行，同时进行的不超过 BATCH_CONCURRENCY 篇
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
         
-        logger.info(f"Calling Zhipu AI API: model={model}, prompt_length={len(prompt)}")
+        async def summarize_limited(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await summarize_article_async(url)
         
-        # 添加重试机制
-        max_retries = 3
-        last_exception = None
+        results = await asyncio.gather(*(summarize_limited(url) for url in urls))
         
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(
-                    api_url,
-                    json=payload,
-                    headers=headers,
-                    timeout=120
-                )
-                break  # 成功则退出循环
-            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
-                last_exception = e
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # 指数退避：2秒、4秒、8秒
-                    logger.warning(f"API call failed (attempt {attempt + 1}/{max_retries}), retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    raise
+        result = {
+            "success": True,
+            "count": len(results),
+            "results": list(results)
+        }
+        return dumps_json(result)
+    
+    except Exception as e:
+        logger.error(f"Unexpected error in parse_articles_batch: {str(e)}")
+        return error_response("INTERNAL_ERROR", "An unexpected error occurred. Please try again.")
+
+
+# 智谱 AI API endpoint
+ZHIPU_API_URL = "https://open.bigmodel.cn/api/paas/v4/chat/completions"
+
+_api_key: Optional[str] = None
+
+def get_api_key() -> Optional[str]:
+    """读取智谱 AI API Key（优先环境变量，其次 config.py），只缓存已找到的 Key；更换 Key 后调用 reset_api_key()"""
+    global _api_key
+    if _api_key:
+        return _api_key
+    api_key = os.getenv("ZHIPU_API_KEY")
+    if not api_key:
+        try:
+            from config import ZHIPU_API_KEY
+            api_key = ZHIPU_API_KEY
+        except ImportError:
+            pass
+    # 未找到时不缓存，之后补充配置无需重启即可生效
+    if api_key:
+        _api_key = api_key
+    return api_key
+
+def reset_api_key() -> None:
+    """清除缓存的 API Key，下次调用时重新读取"""
+    global _api_key
+    _api_key = None
+
+def build_llm_request(
+    prompt: str, model: str, max_tokens: int, temperature: float, system_prompt: str
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """构建智谱 AI API 的请求头和请求体"""
+    api_key = get_api_key()
+    if not api_key:
+        raise Exception("ZHIPU_API_KEY not found. Please set ZHIPU_API_KEY environment variable in MCP configuration.")
+    
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    
+    payload = {
+        "model": model,
+        "messages": [
+            {
+                "role": "system",
+                "content": system_prompt
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "max_tokens": max_tokens,
+        "temperature": temperature
+    }
+    
+    return headers, payload
+
+def extract_llm_content(result: Dict[str, Any]) -> str:
+    """从智谱 AI API 响应中提取回复内容"""
+    if "choices" in result and len(result["choices"]) > 0:
+        content = result["choices"][0]["message"]["content"]
+        logger.info(f"Zhipu AI API response received, length={len(content)}")
+        return content
+    else:
+        raise Exception("Invalid response from Zhipu AI API")
+
+def call_llm_api(
+    prompt: str, model: str = "glm-4", max_tokens: int = 4000, temperature: float = 0.3,
+    system_prompt: str = EXPERT_SYSTEM_PROMPT
+) -> str:
+    """调用智谱 AI API 进行分析，system_prompt 应保持逐字节稳定以命中前缀缓存"""
+    try:
+        headers, payload = build_llm_request(prompt, model, max_tokens, temperature, system_prompt)
         
-        # 如果所有重试都失败，抛出最后一个异常
-        if last_exception:
-            raise last_exception
+        logger.info(f"Calling Zhipu AI API: model={model}, prompt_length={len(prompt)}")
         
-        response.raise_for_status()
-        result = response.json()
+        # 连接失败、超时和网关错误的重试由会话的 HTTPAdapter 处理
+        response = LLM_SESSION.post(
+            ZHIPU_API_URL,
+            json=payload,
+            headers=headers,
+            timeout=120
+        )
         
-        # 智谱 AI API 响应格式
-        if "choices" in result and len(result["choices"]) > 0:
-            content = result["choices"][0]["message"]["content"]
-            logger.info(f"Zhipu AI API response received, length={len(content)}")
-            return content
-        else:
-            raise Exception("Invalid response from Zhipu AI API")
+        response.raise_for_status()
+        return extract_llm_content(orjson.loads(response.content))
             
     except requests.exceptions.RequestException as e:
         logger.error(f"LLM API request error: {str(e)}")
@@ -437,6 +838,33 @@ def call_llm_api(prompt: str, model: str = "glm-4", max_tokens: int = 4000, temp
         logger.error(f"LLM API error: {str(e)}")
         raise
 
+async def call_llm_api_async(
+    prompt: str, model: str = "glm-4", max_tokens: int = 4000, temperature: float = 0.3,
+    system_prompt: str = EXPERT_SYSTEM_PROMPT
+) -> str:
+    """call_llm_api 的异步版本，多个调用可通过 asyncio.gather 并发执行"""
+    try:
+        headers, payload = build_llm_request(prompt, model, max_tokens, temperature, system_prompt)
+        
+        logger.info(f"Calling Zhipu AI API (async): model={model}, prompt_length={len(prompt)}")
+        
+        # 连接失败、超时和网关错误的重试与 LLM_SESSION 一致
+        response = await post_with_retries_async(ZHIPU_API_URL, json=payload, headers=headers)
+        response.raise_for_status()
+        return extract_llm_content(orjson.loads(response.content))
+    
+    except httpx.HTTPError as e:
+        logger.error(f"LLM API request error: {str(e)}")
+        raise Exception(f"Failed to call LLM API: {str(e)}")
+    except Exception as e:
+        logger.error(f"LLM API error: {str(e)}")
+        raise
+
+
+# LLM 返回结果中的代码块标记，一次扫描全部移除：
+# 行首的 ``` 或 ```markdown（连同其后的空白）、行尾的 ```、行中带换行的 ```xxx
+FENCE_RE = re.compile(r'^```[\w]*\s*\n?|```\s*$|```[\w]*\s*\n', re.MULTILINE)
+
 
 @mcp.tool()
 def analyze_with_llm(
@@ -484,107 +912,41 @@ def analyze_with_llm(
         if not final_title:
             final_title = "未命名文章"
         
-        # 根据分析类型构建不同的提示词
-        if analysis_type == "viewpoint":
-            prompt = f"""请对以下微信公众号文章进行观点提取和分析：
-
-**文章标题**: {final_title}
+        # 根据分析类型选择 system 指令（各类型固定不变），user 消息只携带文章
+        system_prompt = ANALYSIS_SYSTEM_PROMPTS.get(analysis_type, ANALYSIS_SYSTEM_PROMPTS["comprehensive"])
+        prompt = f"""**文章标题**: {final_title}
 **作者**: {final_author}
 **文章内容**:
-{final_content[:6000]}
-
-请完成以下分析：
-
-1. **核心观点识别**：提取文章的核心观点（1-2句话）
-2. **分论点链条**：识别文章的主要分论点（3-5个），并说明它们如何支撑核心观点
-3. **论证方式**：分析文章使用了哪些论证方式（案例、数据、引用、故事等）
-4. **观点价值评估**：评估核心观点和分论点的价值（1-5分，说明理由）
-5. **逻辑结构**：分析文章的逻辑结构是否清晰，是否存在逻辑跳跃
-
-请以 Markdown 格式输出，包含表格和结构化内容。"""
-        
-        elif analysis_type == "structure":
-            prompt = f"""请对以下微信公众号文章进行结构分析：
-
-**文章标题**: {final_title}
-**作者**: {final_author}
-**文章内容**:
-{final_content[:6000]}
-
-请完成以下分析：
-
-1. **文章结构**：分析文章的整体结构（开头、主体、结尾）
-2. **段落组织**：分析段落之间的逻辑关系
-3. **过渡衔接**：评估段落之间的过渡是否自然
-4. **层次划分**：识别文章的信息层次（标题、小标题、段落等）
-5. **可读性**：评估文章的可读性，给出改进建议
-
-请以 Markdown 格式输出。"""
-        
-        else:  # comprehensive
-            prompt = f"""请对以下微信公众号文章进行深度综合分析：
-
-**文章标题**: {final_title}
-**作者**: {final_author}
-**文章内容**:
-{final_content[:6000]}
-
-请完成以下综合分析：
-
-## 1. 核心观点提取
-- 核心观点（1-2句话）
-- 分论点链条（3-5个主要分论点）
-- 观点之间的逻辑关系
-
-## 2. 结构分析
-- 文章整体结构（开头、主体、结尾）
-- 段落组织与逻辑关系
-- 过渡衔接是否自然
-
-## 3. 论证方式分析
-- 使用的论证方式（案例、数据、引用、故事、对比等）
-- 每种论证方式的效果评估
-
-## 4. 语言风格分析
-- 语言特点（简洁/冗长、生动/平淡、专业/通俗等）
-- 表达技巧（修辞手法、金句等）
-- 可读性评估
-
-## 5. 价值与影响评估
-- 观点价值（创新性、实用性、传播价值）
-- 目标读者群体
-- 可能的传播效果
-
-请以 Markdown 格式输出，使用表格和结构化内容，确保分析深入、具体、可操作。不要包含优化建议部分。
-
-**重要**：直接输出 Markdown 内容，不要使用代码块（```）包裹。表格应该直接使用 Markdown 表格语法。"""
+{final_content[:6000]}"""
         
         # 调用 LLM API
         try:
-            logger.info(f"Calling LLM for analysis: type={analysis_type}, model={model}, content_length={len(final_content)}")
-            analysis_result = call_llm_api(
-                prompt=prompt,
-                model=model,
-                max_tokens=4000,
-                temperature=0.3
-            )
+            # 相同文章、分析类型和模型的结果直接使用缓存（不同 URL 的相同文章也能命中）
+            analysis_key = cache_key("analysis", analysis_type, model, prompt)
+            analysis_result = RESPONSE_CACHE.get(analysis_key)
+            if analysis_result is None:
+                logger.info(f"Calling LLM for analysis: type={analysis_type}, model={model}, content_length={len(final_content)}")
+                analysis_result = call_llm_api(
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    model=model,
+                    max_tokens=4000,
+                    temperature=0.3
+                )
+                RESPONSE_CACHE.set(analysis_key, analysis_result)
+            else:
+                logger.info(f"LLM analysis cache hit: type={analysis_type}, model={model}")
             
-            # 处理 LLM 返回的结果，移除可能的代码块包裹
-            # 移除开头的代码块标记（可能是 ``` 或 ```markdown 等）
-            analysis_result = re.sub(r'^```[\w]*\s*\n?', '', analysis_result.strip(), flags=re.MULTILINE)
-            # 移除结尾的代码块标记
-            analysis_result = re.sub(r'\n?```\s*$', '', analysis_result, flags=re.MULTILINE)
-            # 移除中间的代码块标记（如果 LLM 在内容中间也加了标记）
-            analysis_result = re.sub(r'```[\w]*\s*\n', '', analysis_result)
-            analysis_result = re.sub(r'\n```\s*\n', '\n', analysis_result)
-            analysis_result = analysis_result.strip()
+            # 处理 LLM 返回的结果，移除可能的代码块包裹（包括 LLM 在内容中间加的标记）
+            analysis_result = FENCE_RE.sub('', analysis_result.strip()).strip()
             
             # 构建完整的分析报告
+            now = datetime.now()
             analysis_markdown = f"""# LLM 深度分析报告（微信公众号文章）
 
 **文章标题**: {final_title}  
 **作者**: {final_author}  
-**分析时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
+**分析时间**: {now.strftime('%Y-%m-%d %H:%M:%S')}  
 **分析类型**: {analysis_type}  
 **使用模型**: {model}  
 **文章统计**: 总字数约 {len(final_content)} 字
@@ -603,32 +965,25 @@ def analyze_with_llm(
                 output_path = Path(save_path)
             else:
                 # 自动生成文件名，保存到项目根目录（添加时间戳）
-                safe_title = "".join(c if c.isalnum() or c in ('-', '_', ' ') else '_' for c in final_title)
-                safe_title = safe_title[:50]
+                safe_title = UNSAFE_CHAR_RE.sub('_', final_title[:50])
                 analysis_type_cn = {
                     "comprehensive": "综合分析",
                     "viewpoint": "观点提取",
                     "structure": "结构分析"
                 }.get(analysis_type, "分析")
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = now.strftime("%Y%m%d_%H%M%S")
                 base_dir = Path("/Users/yingzhang/Library/CloudStorage/Dropbox/Cursor2025")
                 output_path = base_dir / f"{safe_title}-LLM{analysis_type_cn}-{timestamp}.md"
             
-            # 确保目录存在
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # 保存文件
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(analysis_markdown)
-            
-            logger.info(f"LLM analysis saved to: {output_path}")
+            # 后台保存文件，不阻塞返回
+            save_markdown_async(output_path, analysis_markdown)
             
             # 返回结果
             result = {
                 "success": True,
                 "message": "LLM analysis completed successfully",
                 "file_path": str(output_path),
-                "file_size": output_path.stat().st_size if output_path.exists() else 0,
+                "file_size": len(analysis_markdown.encode('utf-8')),
                 "article_info": {
                     "title": final_title,
                     "author": final_author,
@@ -642,7 +997,7 @@ def analyze_with_llm(
                 }
             }
             
-            return json.dumps(result, ensure_ascii=False)
+            return dumps_json(result)
             
         except Exception as e:
             logger.error(f"Failed to call LLM API: {str(e)}")
@@ -0,0 +1,161 @@
+"""server.py 的测试：网络请求全部被替换为假实现"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import server  # noqa: E402
+
+
+WECHAT_PAGE = """<html><head><title>t</title></head><body>
+<h1 class="rich_media_title" id="activity-name">标题</h1>
+<div class="rich_media_content js_underline_content autoTypeSetting24psection" id="js_content">
+<p>第一段正文</p><script>var x = 1;</script><p>第二段正文</p>
+</div>
+<div class="rich_media_content">第二个</div>
+</body></html>"""
+
+
+class FakeResponse:
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+
+    def __init__(self, html):
+        self.content = html.encode("utf-8")
+
+    def raise_for_status(self):
+        pass
+
+
+def test_content_elem_matches_multi_class_body_with_one_parse(monkeypatch):
+    import bs4
+
+    parses = []
+
+    class CountingSoup(bs4.BeautifulSoup):
+        def __init__(self, *args, **kwargs):
+            parses.append(args)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(bs4, "BeautifulSoup", CountingSoup)
+    monkeypatch.setattr(server.SESSION, "get", lambda url, timeout=None: FakeResponse(WECHAT_PAGE))
+
+    article = server.fetch_wechat_article("https://mp.weixin.qq.com/s/x")
+
+    # 命中带多个 class 的 #js_content，而不是后面只有单个 class 的 div
+    assert article["content"]["text"] == "第一段正文第二段正文"
+    assert article["title"] == "标题"
+    assert len(parses) == 1
+
+
+def test_missing_api_key_is_not_cached(monkeypatch):
+    monkeypatch.delenv("ZHIPU_API_KEY", raising=False)
+    monkeypatch.setitem(sys.modules, "config", None)
+    server.reset_api_key()
+
+    assert server.get_api_key() is None
+
+    # 补充配置后无需重启即可读取到
+    monkeypatch.setenv("ZHIPU_API_KEY", "key-1")
+    assert server.get_api_key() == "key-1"
+
+    # 找到的 Key 会被缓存，reset_api_key() 后重新读取
+    monkeypatch.setenv("ZHIPU_API_KEY", "key-2")
+    assert server.get_api_key() == "key-1"
+    server.reset_api_key()
+    assert server.get_api_key() == "key-2"
+    server.reset_api_key()
+
+
+def test_async_post_retries_like_sync_session(monkeypatch):
+    import asyncio
+
+    import httpx
+
+    statuses = []
+
+    async def fake_post(url, **kwargs):
+        statuses.append(responses[len(statuses)])
+        status = statuses[-1]
+        if status is None:
+            raise httpx.ConnectError("connection refused")
+        return httpx.Response(status)
+
+    monkeypatch.setattr(server.ASYNC_CLIENT, "post", fake_post)
+    monkeypatch.setattr(server, "retry_backoff", lambda retry: 0)
+
+    # 与 LLM_SESSION 的 Retry 配置一致：最多尝试 HTTP_RETRIES + 1 次
+    assert server.LLM_SESSION.get_adapter(server.ZHIPU_API_URL).max_retries.total == server.HTTP_RETRIES
+
+    # 网关错误和连接失败都会重试
+    responses = [503, None, 200]
+    assert asyncio.run(server.post_with_retries_async(server.ZHIPU_API_URL)).status_code == 200
+    assert len(statuses) == 3
+
+    # 重试用尽后返回最后一次的网关错误响应
+    statuses.clear()
+    responses = [502, 502, 502, 200]
+    assert asyncio.run(server.post_with_retries_async(server.ZHIPU_API_URL)).status_code == 502
+    assert len(statuses) == server.HTTP_RETRIES + 1
+
+    # 连接一直失败时抛出最后一次的异常
+    statuses.clear()
+    responses = [None, None, None]
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(server.post_with_retries_async(server.ZHIPU_API_URL))
+    assert len(statuses) == server.HTTP_RETRIES + 1
+
+    # 其他错误状态码不重试
+    statuses.clear()
+    responses = [500, 200]
+    assert asyncio.run(server.post_with_retries_async(server.ZHIPU_API_URL)).status_code == 500
+    assert len(statuses) == 1
+
+
+def test_sync_and_async_summaries_share_cache(monkeypatch):
+    import asyncio
+
+    calls = []
+
+    def fake_call(prompt, **kwargs):
+        calls.append(kwargs)
+        return " 摘要 "
+
+    async def failing_async_call(prompt, **kwargs):
+        raise AssertionError("cache should have been hit")
+
+    monkeypatch.setattr(server, "call_llm_api", fake_call)
+    monkeypatch.setattr(server, "call_llm_api_async", failing_async_call)
+    server.RESPONSE_CACHE.clear()
+    content = "正文" * 100
+
+    assert server.generate_detailed_summary("短", "标题") == "文章内容过短，无法生成详细摘要。"
+    assert server.generate_detailed_summary(content, "标题") == "摘要"
+    assert asyncio.run(server.generate_detailed_summary_async(content, "标题")) == "摘要"
+    assert calls == [server.SUMMARY_LLM_OPTIONS]
+    server.RESPONSE_CACHE.clear()
+
+
+def test_batch_limits_concurrent_articles(monkeypatch):
+    import asyncio
+    import json
+
+    running = []
+    peak = []
+
+    async def fake_summarize(url):
+        running.append(url)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(url)
+        return {"success": True, "url": url}
+
+    monkeypatch.setattr(server, "summarize_article_async", fake_summarize)
+    urls = [f"https://mp.weixin.qq.com/s/{index}" for index in range(20)]
+    batch = getattr(server.parse_articles_batch, "fn", server.parse_articles_batch)
+
+    result = json.loads(asyncio.run(batch(urls)))
+
+    assert max(peak) == server.BATCH_CONCURRENCY
+    assert [item["url"] for item in result["results"]] == urls